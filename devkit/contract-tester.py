@@ -13,9 +13,14 @@ import os
 import json
 import asyncio
 import argparse
+import functools
+import hashlib
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Dict, List, Any
 import subprocess
+import socket
 import time
 import signal
 import sys
@@ -27,21 +32,164 @@ except ImportError:
     print("❌ Dépendances manquantes. Installer avec: pip install paho-mqtt jsonschema")
     sys.exit(1)
 
+try:
+    import fastjsonschema  # Optionnel: compilation de schémas plus rapide
+except ImportError:
+    fastjsonschema = None
+
+try:
+    import orjson  # Optionnel: parsing JSON 3-5x plus rapide sur le chemin chaud
+except ImportError:
+    orjson = None
+
+try:
+    import gmqtt  # Optionnel: client MQTT asyncio natif, sans thread de dispatch
+except ImportError:
+    gmqtt = None
+
+
+def loads_payload(raw):
+    """Parse un payload JSON depuis des bytes (orjson si disponible)"""
+    if orjson:
+        return orjson.loads(raw)
+    return json.loads(raw.decode())
+
+
+def parse_json_file(path):
+    """Lit et parse un fichier JSON; retourne (path, contenu, erreur éventuelle)"""
+    try:
+        return path, loads_payload(path.read_bytes()), None
+    except Exception as e:
+        return path, None, e
+
+
+def load_json_dir(dir_path):
+    """Parse tous les fichiers JSON d'un répertoire en parallèle (lectures I/O)"""
+    files = sorted(dir_path.glob("*.json"))
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        return list(executor.map(parse_json_file, files))
+
+
+# Exceptions levées par un validateur compilé (selon le backend disponible)
+VALIDATION_ERRORS = (jsonschema.ValidationError,)
+if fastjsonschema:
+    VALIDATION_ERRORS += (fastjsonschema.JsonSchemaException,)
+
+
+def compile_schema(schema):
+    """Compile un schéma JSON en validateur appelable (payload -> lève si invalide)
+
+    La compilation est mémoïsée au niveau du process: le même schéma
+    (clés triées pour une forme canonique) n'est compilé qu'une fois,
+    même à travers plusieurs instances de ContractTester.
+    """
+    if orjson:
+        schema_bytes = orjson.dumps(schema, option=orjson.OPT_SORT_KEYS)
+    else:
+        schema_bytes = json.dumps(schema, sort_keys=True).encode()
+    return _compile_schema_cached(hashlib.blake2b(schema_bytes).digest(), schema_bytes)
+
+
+@functools.lru_cache(maxsize=256)
+def _compile_schema_cached(schema_hash, schema_bytes):
+    schema = loads_payload(schema_bytes)
+    if fastjsonschema:
+        return fastjsonschema.compile(schema)
+    validator_cls = jsonschema.validators.validator_for(schema)
+    validator_cls.check_schema(schema)
+    return validator_cls(schema).validate
+
+class TopicTrie:
+    """Trie de topics MQTT segment par segment, avec support des wildcards + et #
+
+    Chaque topic entrant est parcouru une seule fois, quel que soit le
+    nombre de contrats enregistrés (O(profondeur) au lieu de O(contrats)).
+    """
+
+    # Clé sentinelle pour les buckets terminaux (None ne peut pas être un segment)
+    _BUCKETS = None
+
+    def __init__(self):
+        self.root = {}
+
+    def insert(self, pattern, bucket):
+        """Enregistre un bucket sous un pattern de topic (ex: symbion/+/heartbeat@v2)"""
+        node = self.root
+        for segment in pattern.split('/'):
+            node = node.setdefault(segment, {})
+        node.setdefault(self._BUCKETS, []).append(bucket)
+
+    def match(self, topic):
+        """Retourne tous les buckets dont le pattern correspond au topic"""
+        buckets = []
+        self._walk(self.root, topic.split('/'), 0, buckets)
+        return buckets
+
+    def _walk(self, node, segments, index, out):
+        # '#' absorbe tous les niveaux restants (y compris zéro)
+        multi = node.get('#')
+        if multi is not None:
+            out.extend(multi.get(self._BUCKETS, ()))
+
+        if index == len(segments):
+            out.extend(node.get(self._BUCKETS, ()))
+            return
+
+        segment = segments[index]
+        child = node.get(segment)
+        if child is not None:
+            self._walk(child, segments, index + 1, out)
+
+        plus = node.get('+')
+        if plus is not None and plus is not child:
+            self._walk(plus, segments, index + 1, out)
+
+
 class ContractTester:
-    def __init__(self, broker_host="127.0.0.1", broker_port=1883):
+    # Fréquence (en messages) du résumé agrégé affiché en mode non-verbose
+    SUMMARY_EVERY = 1000
+    # Nombre d'échecs de validation conservés par contrat pour le rapport
+    FAIL_SAMPLES = 10
+    # Port HTTP du kernel (axum, cf. symbion-kernel/src/main.rs) et délai max
+    # accordé à son démarrage
+    KERNEL_HTTP_PORT = 8080
+    KERNEL_READY_TIMEOUT = 10
+
+    def __init__(self, broker_host="127.0.0.1", broker_port=1883,
+                 max_buffer=100_000, verbose=False, backend="paho",
+                 keep_samples=False):
         self.broker_host = broker_host
         self.broker_port = broker_port
+        self.backend = backend
+        self.max_buffer = max_buffer
+        self.verbose = verbose
+        self.keep_samples = keep_samples
         self.client = None
-        self.messages = []
+        self.loop = None
+        self.messages_by_topic: Dict[str, deque] = {}
+        self.topic_counts = Counter()
+        self.message_count = 0
+        self.topic_trie = TopicTrie()
+        # Statistiques de validation accumulées en flux, par contrat
+        self.contract_records: Dict[str, dict] = {}
         self.kernel_process = None
         self.plugin_processes = []
         
-    def setup_mqtt(self):
+    async def setup_mqtt(self):
         """Configure le client MQTT pour écouter les messages"""
+        if self.backend == "gmqtt":
+            return await self._setup_gmqtt()
+
         self.client = mqtt.Client()
         self.client.on_connect = self._on_connect
         self.client.on_message = self._on_message
-        
+
+        # Fenêtres larges pour soutenir un fort débit: la valeur par défaut
+        # de paho (20 messages en vol) bride la réception
+        self.client.max_inflight_messages_set(1000)
+        self.client.max_queued_messages_set(0)  # 0 = file sortante illimitée
+        self.client.reconnect_delay_set(min_delay=1, max_delay=30)
+
         try:
             self.client.connect(self.broker_host, self.broker_port, 60)
             self.client.loop_start()
@@ -50,27 +198,104 @@ class ContractTester:
         except Exception as e:
             print(f"❌ Failed to connect to MQTT broker: {e}")
             return False
-    
+
+    async def _setup_gmqtt(self):
+        """Client asyncio natif: pas de thread de dispatch Python borné par le GIL"""
+        if gmqtt is None:
+            print("❌ Backend gmqtt non installé. Installer avec: pip install gmqtt")
+            return False
+
+        self.client = gmqtt.Client("symbion-contract-tester")
+
+        def on_connect(client, flags, rc, properties):
+            client.subscribe([
+                gmqtt.Subscription("symbion/+/+", qos=0),
+                gmqtt.Subscription("symbion/+/+/+", qos=0),
+            ])
+            print("✅ Subscribed to all symbion topics")
+
+        def on_message(client, topic, payload, qos, properties):
+            # Déjà sur la boucle asyncio: traitement direct, sans handoff inter-thread
+            self._handle_message(topic, payload)
+
+        self.client.on_connect = on_connect
+        self.client.on_message = on_message
+
+        try:
+            await self.client.connect(self.broker_host, self.broker_port)
+            print(f"📡 Connected to MQTT broker at {self.broker_host}:{self.broker_port} (gmqtt)")
+            return True
+        except Exception as e:
+            print(f"❌ Failed to connect to MQTT broker: {e}")
+            return False
+
     def _on_connect(self, client, userdata, flags, rc):
         if rc == 0:
-            # S'abonner à tous les topics symbion
-            client.subscribe("symbion/+/+")
-            client.subscribe("symbion/+/+/+")
+            # Désactiver Nagle: les petits messages MQTT partent sans délai
+            try:
+                client.socket().setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+            except (OSError, AttributeError):
+                pass
+
+            # S'abonner à tous les topics symbion en un seul paquet SUBSCRIBE
+            client.subscribe([("symbion/+/+", 0), ("symbion/+/+/+", 0)])
             print("✅ Subscribed to all symbion topics")
         else:
             print(f"❌ MQTT connection failed with code {rc}")
     
     def _on_message(self, client, userdata, msg):
+        # Appelé depuis le thread réseau paho: on repasse la main à la boucle
+        # asyncio pour que toutes les structures soient touchées du même thread
+        self.loop.call_soon_threadsafe(self._handle_message, msg.topic, bytes(msg.payload))
+
+    def _handle_message(self, topic, raw_payload):
         try:
-            payload = json.loads(msg.payload.decode())
-            self.messages.append({
-                'topic': msg.topic,
-                'payload': payload,
-                'timestamp': time.time()
-            })
-            print(f"📨 Received: {msg.topic} -> {json.dumps(payload, indent=2)}")
+            payload = loads_payload(raw_payload)
+            self.topic_counts[topic] += 1
+            self.message_count += 1
+
+            # Les payloads ne sont conservés que sur demande: la validation
+            # se fait en flux, seuls les compteurs sont nécessaires au rapport
+            if self.keep_samples:
+                message = {
+                    'topic': topic,
+                    'payload': payload,
+                    'timestamp': time.time()
+                }
+                bucket = self.messages_by_topic.get(topic)
+                if bucket is None:
+                    # Buffer circulaire borné: la mémoire reste constante même
+                    # sur des runs longs à fort débit
+                    bucket = self.messages_by_topic[topic] = deque(maxlen=self.max_buffer)
+                bucket.append(message)
+
+            # Router vers les contrats dont le pattern (wildcards inclus)
+            # correspond, et valider immédiatement: une seule passe
+            for record in self.topic_trie.match(topic):
+                record['count'] += 1
+                if self.keep_samples:
+                    record['messages'].append(message)
+                validator = record['validator']
+                if validator:
+                    try:
+                        validator(payload)
+                        record['passed'] += 1
+                    except VALIDATION_ERRORS as e:
+                        record['failed'] += 1
+                        record['fail_samples'].append(getattr(e, 'message', str(e)))
+                    except Exception as e:
+                        record['failed'] += 1
+                        record['fail_samples'].append(str(e))
+            # Jamais de sérialisation du payload ici: même en verbose on ne
+            # logge que le topic et la taille, le corps coûte plus cher que
+            # la validation elle-même
+            if self.verbose:
+                print(f"📨 Received: {topic} ({len(raw_payload)} bytes)")
+            elif self.message_count % self.SUMMARY_EVERY == 0:
+                print(f"📨 {self.message_count} messages collected "
+                      f"({len(self.topic_counts)} topics)")
         except json.JSONDecodeError as e:
-            print(f"⚠️ Invalid JSON in topic {msg.topic}: {e}")
+            print(f"⚠️ Invalid JSON in topic {topic}: {e}")
     
     def load_contracts(self, contracts_dir):
         """Charge tous les contrats MQTT"""
@@ -81,18 +306,39 @@ class ContractTester:
             print(f"❌ Contracts directory not found: {contracts_dir}")
             return contracts
         
-        for contract_file in contracts_path.glob("*.json"):
+        for contract_file, contract, error in load_json_dir(contracts_path):
+            if error:
+                print(f"⚠️ Failed to load contract {contract_file}: {error}")
+                continue
             try:
-                with open(contract_file) as f:
-                    contract = json.load(f)
-                    contract_name = contract.get('name', contract_file.stem)
-                    contracts[contract_name] = contract
-                    print(f"📜 Loaded contract: {contract_name}")
+                contract_name = contract.get('name', contract_file.stem)
+                # Compiler le schéma dès le chargement: les schémas changent
+                # rarement, autant sortir la compilation du chemin chaud
+                if contract.get('schema'):
+                    contract['_validator'] = compile_schema(contract['schema'])
+                contracts[contract_name] = contract
+                print(f"📜 Loaded contract: {contract_name}")
             except Exception as e:
                 print(f"⚠️ Failed to load contract {contract_file}: {e}")
         
         return contracts
-    
+
+    def register_contracts(self, contracts):
+        """Indexe les topics des contrats dans le trie pour le routage + validation en flux"""
+        for contract_name, contract in contracts.items():
+            topic = contract.get('topic', '')
+            if not topic:
+                continue
+            record = self.contract_records.setdefault(contract_name, {
+                'validator': contract.get('_validator'),
+                'count': 0,
+                'passed': 0,
+                'failed': 0,
+                'fail_samples': deque(maxlen=self.FAIL_SAMPLES),
+                'messages': deque(maxlen=self.max_buffer),
+            })
+            self.topic_trie.insert(topic, record)
+
     def load_plugin_manifests(self, plugins_dir):
         """Charge tous les manifestes de plugins"""
         plugins = {}
@@ -102,20 +348,18 @@ class ContractTester:
             print(f"❌ Plugins directory not found: {plugins_dir}")
             return plugins
         
-        for plugin_file in plugins_path.glob("*.json"):
-            try:
-                with open(plugin_file) as f:
-                    plugin = json.load(f)
-                    plugin_name = plugin.get('name', plugin_file.stem)
-                    plugins[plugin_name] = plugin
-                    print(f"🔌 Loaded plugin manifest: {plugin_name}")
-            except Exception as e:
-                print(f"⚠️ Failed to load plugin manifest {plugin_file}: {e}")
+        for plugin_file, plugin, error in load_json_dir(plugins_path):
+            if error:
+                print(f"⚠️ Failed to load plugin manifest {plugin_file}: {error}")
+                continue
+            plugin_name = plugin.get('name', plugin_file.stem)
+            plugins[plugin_name] = plugin
+            print(f"🔌 Loaded plugin manifest: {plugin_name}")
         
         return plugins
     
-    def start_kernel(self):
-        """Démarre le kernel Symbion"""
+    async def start_kernel(self):
+        """Démarre le kernel Symbion et attend qu'il soit réellement prêt"""
         try:
             env = os.environ.copy()
             env['SYMBION_API_KEY'] = 'test-key'
@@ -128,47 +372,87 @@ class ContractTester:
                 stderr=subprocess.PIPE
             )
             print("🚀 Starting Symbion kernel...")
-            time.sleep(3)  # Attendre le démarrage
+
+            # Sonde TCP sur l'API du kernel plutôt qu'une attente fixe:
+            # on rend la main dès que le port répond
+            deadline = time.monotonic() + self.KERNEL_READY_TIMEOUT
+            while time.monotonic() < deadline:
+                try:
+                    socket.create_connection(
+                        ('127.0.0.1', self.KERNEL_HTTP_PORT), timeout=0.2).close()
+                    print("✅ Kernel ready")
+                    return True
+                except OSError:
+                    await asyncio.sleep(0.05)
+
+            print(f"⚠️ Kernel not ready after {self.KERNEL_READY_TIMEOUT}s, continuing anyway")
             return True
         except Exception as e:
             print(f"❌ Failed to start kernel: {e}")
             return False
     
-    def start_plugin(self, plugin_name, plugin_manifest):
-        """Démarre un plugin spécifique"""
+    def _build_plugin(self, plugin_name, plugin_manifest):
+        """Lance la compilation d'un plugin en arrière-plan (retourne le process ou None)"""
+        binary_path = plugin_manifest.get('binary', '')
+        if not binary_path:
+            return None
+
+        plugin_dir = Path(binary_path).parent.parent
+        if not plugin_dir.exists():
+            return None
+
+        return subprocess.Popen(
+            ['cargo', 'build'],
+            cwd=plugin_dir,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.PIPE
+        )
+
+    def _spawn_plugin_binary(self, plugin_name, plugin_manifest, base_env):
+        """Démarre le binaire d'un plugin déjà compilé"""
         try:
             binary_path = plugin_manifest.get('binary', '')
             if not binary_path:
                 print(f"⚠️ No binary path for plugin {plugin_name}")
                 return False
-            
-            # Construire le plugin d'abord
-            plugin_dir = Path(binary_path).parent.parent
-            if plugin_dir.exists():
-                build_result = subprocess.run(
-                    ['cargo', 'build'],
-                    cwd=plugin_dir,
-                    capture_output=True
-                )
-                if build_result.returncode != 0:
-                    print(f"❌ Failed to build plugin {plugin_name}")
-                    return False
-            
-            # Démarrer le plugin
+
+            # Ne fusionner que si le manifest surcharge des variables
+            overrides = plugin_manifest.get('env')
             process = subprocess.Popen(
                 [binary_path],
-                env={**os.environ, **plugin_manifest.get('env', {})},
+                env={**base_env, **overrides} if overrides else base_env,
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE
             )
-            
+
             self.plugin_processes.append(process)
             print(f"🔌 Started plugin: {plugin_name}")
             return True
-            
+
         except Exception as e:
             print(f"❌ Failed to start plugin {plugin_name}: {e}")
             return False
+
+    def start_plugins(self, plugins):
+        """Compile tous les plugins en parallèle, puis démarre leurs binaires"""
+        builds = {}
+        for plugin_name, plugin_manifest in plugins.items():
+            build = self._build_plugin(plugin_name, plugin_manifest)
+            if build is not None:
+                builds[plugin_name] = build
+
+        # Attendre toutes les compilations (coût borné par la plus lente)
+        failed = set()
+        for plugin_name, build in builds.items():
+            if build.wait() != 0:
+                print(f"❌ Failed to build plugin {plugin_name}")
+                failed.add(plugin_name)
+
+        # Copier l'environnement une seule fois pour tous les plugins
+        base_env = os.environ.copy()
+        for plugin_name, plugin_manifest in plugins.items():
+            if plugin_name not in failed:
+                self._spawn_plugin_binary(plugin_name, plugin_manifest, base_env)
     
     def validate_contract_compliance(self, contracts, plugins):
         """Valide que les plugins respectent leurs contrats"""
@@ -186,40 +470,31 @@ class ContractTester:
                     print(f"⚠️ Plugin {plugin_name} references unknown contract: {contract_name}")
     
     def _validate_plugin_contract(self, plugin_name, contract):
-        """Valide qu'un plugin respecte un contrat spécifique"""
+        """Rapporte la conformité d'un plugin à un contrat (validée en flux)"""
         contract_name = contract.get('name', 'unknown')
         expected_topic = contract.get('topic', '')
-        schema = contract.get('schema', {})
-        
+
         print(f"  🔍 Checking contract {contract_name} for plugin {plugin_name}")
-        
-        # Rechercher les messages correspondants
-        matching_messages = [
-            msg for msg in self.messages 
-            if msg['topic'] == expected_topic
-        ]
-        
-        if not matching_messages:
+
+        # Les messages ont déjà été validés à la réception: tout est dans le record
+        record = self.contract_records.get(contract_name)
+        if not record or record['count'] == 0:
             print(f"    ⚠️ No messages found for topic: {expected_topic}")
             return
-        
-        # Valider le schéma JSON si présent
-        if schema:
-            for msg in matching_messages:
-                try:
-                    jsonschema.validate(msg['payload'], schema)
-                    print(f"    ✅ Message validates against schema")
-                except jsonschema.ValidationError as e:
-                    print(f"    ❌ Schema validation failed: {e.message}")
-                except Exception as e:
-                    print(f"    ⚠️ Schema validation error: {e}")
-        
-        print(f"    📊 Found {len(matching_messages)} messages for {contract_name}")
+
+        if record['validator']:
+            print(f"    ✅ {record['passed']}/{record['count']} messages validate against schema")
+            for failure in record['fail_samples']:
+                print(f"    ❌ Schema validation failed: {failure}")
+
+        print(f"    📊 Found {record['count']} messages for {contract_name}")
     
-    def run_tests(self, contracts_dir="contracts/mqtt", plugins_dir="plugins", duration=10):
+    async def run_tests(self, contracts_dir="contracts/mqtt", plugins_dir="plugins", duration=10):
         """Lance les tests contractuels complets"""
         print("🧪 Starting Symbion Contract Tests")
         print("=" * 50)
+
+        self.loop = asyncio.get_running_loop()
         
         # Chargement des données
         contracts = self.load_contracts(contracts_dir)
@@ -232,29 +507,37 @@ class ContractTester:
         if not plugins:
             print("❌ No plugins loaded. Aborting.")
             return False
-        
+
+        # Indexer les topics des contrats avant de recevoir le moindre message
+        self.register_contracts(contracts)
+
         # Setup MQTT
-        if not self.setup_mqtt():
+        if not await self.setup_mqtt():
             return False
         
         # Démarrage des composants
-        if not self.start_kernel():
+        if not await self.start_kernel():
             return False
         
-        # Démarrage des plugins
-        for plugin_name, plugin_manifest in plugins.items():
-            self.start_plugin(plugin_name, plugin_manifest)
+        # Compilation parallèle puis démarrage des plugins
+        self.start_plugins(plugins)
         
-        # Collecte des messages
+        # Collecte des messages (annulable par SIGINT, le thread paho continue
+        # de recevoir pendant que la boucle asyncio traite les messages)
         print(f"\\n⏱️ Collecting messages for {duration} seconds...")
-        time.sleep(duration)
+        await asyncio.sleep(duration)
         
         # Validation des contrats
         self.validate_contract_compliance(contracts, plugins)
         
         # Rapport final
         self._generate_report()
-        
+
+        # La déconnexion gmqtt est asynchrone: la faire ici, sur la boucle
+        if self.backend == "gmqtt" and self.client:
+            await self.client.disconnect()
+            self.client = None
+
         return True
     
     def _generate_report(self):
@@ -262,19 +545,18 @@ class ContractTester:
         print("\\n" + "=" * 50)
         print("📊 CONTRACT TESTING REPORT")
         print("=" * 50)
-        print(f"Total messages collected: {len(self.messages)}")
-        
-        # Grouper par topic
-        topics = {}
-        for msg in self.messages:
-            topic = msg['topic']
-            if topic not in topics:
-                topics[topic] = 0
-            topics[topic] += 1
-        
+        print(f"Total messages collected: {self.message_count}")
+        passed = sum(r['passed'] for r in self.contract_records.values())
+        failed = sum(r['failed'] for r in self.contract_records.values())
+        if passed or failed:
+            print(f"Stream validation: {passed} passed, {failed} failed")
+
+        # Une seule écriture stdout quel que soit le nombre de topics
         print("\\n📡 Messages by topic:")
-        for topic, count in sorted(topics.items()):
-            print(f"  {topic}: {count} messages")
+        lines = [f"  {topic}: {count} messages"
+                 for topic, count in sorted(self.topic_counts.items())]
+        if lines:
+            sys.stdout.write("\n".join(lines) + "\n")
         
         print("\\n✅ Contract testing completed")
     
@@ -282,25 +564,26 @@ class ContractTester:
         """Nettoyage des processus"""
         print("\\n🧹 Cleaning up...")
         
-        if self.client:
+        if self.client and self.backend == "paho":
             self.client.loop_stop()
             self.client.disconnect()
         
-        # Arrêter les plugins
-        for process in self.plugin_processes:
+        # Arrêter plugins et kernel: tous les SIGTERM d'abord, puis une
+        # attente commune — le coût est borné par le process le plus lent,
+        # pas par la somme des timeouts
+        processes = [p for p in self.plugin_processes + [self.kernel_process] if p]
+        for process in processes:
             try:
                 process.terminate()
-                process.wait(timeout=5)
-            except:
-                process.kill()
-        
-        # Arrêter le kernel
-        if self.kernel_process:
+            except OSError:
+                pass
+
+        deadline = time.monotonic() + 5
+        for process in processes:
             try:
-                self.kernel_process.terminate()
-                self.kernel_process.wait(timeout=5)
-            except:
-                self.kernel_process.kill()
+                process.wait(timeout=max(0, deadline - time.monotonic()))
+            except Exception:
+                process.kill()
 
 def main():
     parser = argparse.ArgumentParser(description="Symbion Contract Tester")
@@ -314,24 +597,38 @@ def main():
                        help="MQTT broker host")
     parser.add_argument("--broker-port", type=int, default=1883,
                        help="MQTT broker port")
-    
+    parser.add_argument("--max-buffer", type=int, default=100_000,
+                       help="Nombre max de messages conservés par topic")
+    parser.add_argument("--verbose", action="store_true",
+                       help="Afficher chaque message reçu")
+    parser.add_argument("--backend", choices=["paho", "gmqtt"], default="paho",
+                       help="Client MQTT (gmqtt: asyncio natif, nécessite pip install gmqtt)")
+    parser.add_argument("--keep-samples", action="store_true",
+                       help="Conserver les payloads reçus (sinon: compteurs seuls)")
+
     args = parser.parse_args()
-    
-    tester = ContractTester(args.broker_host, args.broker_port)
-    
-    def signal_handler(sig, frame):
-        print("\\n🛑 Interrupted by user")
-        tester.cleanup()
-        sys.exit(0)
-    
-    signal.signal(signal.SIGINT, signal_handler)
-    
+
+    tester = ContractTester(args.broker_host, args.broker_port,
+                            max_buffer=args.max_buffer, verbose=args.verbose,
+                            backend=args.backend, keep_samples=args.keep_samples)
+
+    async def run():
+        loop = asyncio.get_running_loop()
+        task = asyncio.current_task()
+        # SIGINT annule proprement la collecte au lieu de tuer le process
+        loop.add_signal_handler(signal.SIGINT, task.cancel)
+        try:
+            return await tester.run_tests(
+                args.contracts_dir,
+                args.plugins_dir,
+                args.duration
+            )
+        except asyncio.CancelledError:
+            print("\\n🛑 Interrupted by user")
+            return False
+
     try:
-        success = tester.run_tests(
-            args.contracts_dir,
-            args.plugins_dir, 
-            args.duration
-        )
+        success = asyncio.run(run())
         tester.cleanup()
         sys.exit(0 if success else 1)
     except Exception as e:
@@ -12,15 +12,29 @@ Génère rapidement un nouveau plugin Symbion avec:
 import os
 import json
 import argparse
+from functools import lru_cache
 from pathlib import Path
+from string import Template
 import shutil
 import re
 
+try:
+    import orjson  # Optionnel: parsing JSON plus rapide
+except ImportError:
+    orjson = None
+
+_TEMPLATES_DIR = Path(__file__).parent / "templates" / "plugin"
+
+@lru_cache(maxsize=None)
+def load_template(relative_path):
+    """Retourne le template pré-parsé (lu sur disque une seule fois par process)"""
+    return Template((_TEMPLATES_DIR / relative_path).read_text())
+
 def load_contract(contract_path):
     """Charge un contrat JSON et extrait les métadonnées"""
-    with open(contract_path) as f:
-        contract = json.load(f)
-    
+    raw = Path(contract_path).read_bytes()
+    contract = orjson.loads(raw) if orjson else json.loads(raw.decode())
+
     return {
         'name': contract.get('name', ''),
         'version': contract.get('version', 'v1'),
@@ -62,19 +76,21 @@ def json_type_to_rust(json_type):
     }
     return mapping.get(json_type, 'String')
 
+# Séparateurs de mots acceptés dans les noms (compilé une fois)
+_WORD_SEP_RE = re.compile(r'[_\-.]')
+
 def camel_case(text):
     """Convertit en CamelCase"""
-    return ''.join(word.capitalize() for word in re.split(r'[_\-.]', text))
+    return ''.join(word.capitalize() for word in _WORD_SEP_RE.split(text))
 
 def snake_case(text):
     """Convertit en snake_case"""
-    return re.sub(r'[_\-.]', '_', text.lower())
+    return _WORD_SEP_RE.sub('_', text.lower())
 
 def scaffold_plugin(plugin_name, contracts, description, output_dir):
     """Génère un plugin complet"""
     
     # Chemins
-    templates_dir = Path(__file__).parent / "templates" / "plugin"
     plugin_dir = Path(output_dir) / plugin_name
     contracts_dir = Path(__file__).parent.parent / "contracts" / "mqtt"
     
@@ -132,26 +148,19 @@ def scaffold_plugin(plugin_name, contracts, description, output_dir):
         'ENV_VARS': []
     }
     
-    # Générer Cargo.toml
-    with open(templates_dir / "Cargo.toml.template") as f:
-        cargo_content = f.read().replace("{{PLUGIN_NAME}}", plugin_name)
-    
-    with open(plugin_dir / "Cargo.toml", "w") as f:
-        f.write(cargo_content)
-    
-    # Générer main.rs (template basique)
-    with open(templates_dir / "src/main.rs.template") as f:
-        main_content = f.read()
-    
-    # Remplacements basiques (Handlebars serait mieux mais gardons Python pur)
-    main_content = main_content.replace("{{PLUGIN_NAME}}", plugin_name)
-    
-    # Ajouter les structs
+    # Générer Cargo.toml (template pré-parsé, mis en cache entre les appels)
+    cargo_content = load_template("Cargo.toml.template").substitute(
+        PLUGIN_NAME=plugin_name)
+    (plugin_dir / "Cargo.toml").write_text(cargo_content)
+
+    # Générer main.rs: une seule passe de substitution quel que soit le
+    # nombre de variables (string.Template plutôt que des .replace chaînés)
     structs_code = "\n".join([s['definition'] for s in structs])
-    main_content = main_content.replace("// ===== Data Structures =====", f"// ===== Data Structures ====={structs_code}")
-    
-    with open(plugin_dir / "src" / "main.rs", "w") as f:
-        f.write(main_content)
+    main_content = load_template("src/main.rs.template").substitute(
+        PLUGIN_NAME=plugin_name,
+        STRUCTS_CODE=structs_code
+    )
+    (plugin_dir / "src" / "main.rs").write_text(main_content)
     
     # Générer plugin.json
     manifest = {